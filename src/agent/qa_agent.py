@@ -7,6 +7,7 @@ from config import GEMINI_API_KEY, GEMINI_MODEL_TEXT, MAX_CONTEXT_CHARS, TOP_K_D
 from models import AgentAnswer, DocumentRecord, RetrievalResult, ToolCall
 from retrieval.vector_store import VectorStore
 from tools.arxiv_tool import format_arxiv_results, search_arxiv
+from utils import metrics
 from agent.prompts import SYSTEM_PROMPT, TOOL_ROUTER_PROMPT
 
 
@@ -17,38 +18,50 @@ def answer_query(
     enable_arxiv: bool = True,
     top_k: int = TOP_K_DEFAULT,
 ) -> AgentAnswer:
-    require_api_key()
-    genai.configure(api_key=GEMINI_API_KEY)
-
-    tool_calls: List[ToolCall] = []
-    extra: Dict[str, str] = {}
-
-    if enable_arxiv:
-        tool_call = _route_tool_call(query)
-        if tool_call and tool_call.tool == "arxiv_search":
-            tool_calls.append(tool_call)
-            results = search_arxiv(tool_call.args.get("query", query))
-            extra["arxiv"] = format_arxiv_results(results)
-
-    results = _retrieve_context(query, store, documents, top_k)
-    context_text, citations = _build_context(results)
-
-    model = genai.GenerativeModel(GEMINI_MODEL_TEXT, system_instruction=SYSTEM_PROMPT)
-    response = model.generate_content(
-        [
-            f"Context:\n{context_text}",
-            f"Question: {query}",
-            "Answer with citations in the form [doc_id:page].",
-        ]
-    )
-    answer_text = response.text.strip() if response.text else ""
-
-    return AgentAnswer(answer=answer_text, citations=citations, tool_calls=tool_calls, extra=extra or None)
+    with metrics.span("answer_query", top_k=top_k, enable_arxiv=enable_arxiv):
+        require_api_key()
+        genai.configure(api_key=GEMINI_API_KEY)
+
+        tool_calls: List[ToolCall] = []
+        extra: Dict[str, str] = {}
+
+        if enable_arxiv:
+            with metrics.span("route_tool_call"):
+                tool_call = _route_tool_call(query)
+            if tool_call and tool_call.tool == "arxiv_search":
+                tool_calls.append(tool_call)
+                with metrics.span("arxiv_search"):
+                    results = search_arxiv(tool_call.args.get("query", query))
+                extra["arxiv"] = format_arxiv_results(results)
+
+        with metrics.span("retrieve_context") as retrieve_span:
+            results = _retrieve_context(query, store, documents, top_k)
+            retrieve_span.set(results=len(results))
+        with metrics.span("build_context") as context_span:
+            context_text, citations = _build_context(results)
+            context_span.set(chars=len(context_text), citations=len(citations))
+
+        with metrics.span("generate", model=GEMINI_MODEL_TEXT):
+            model = genai.GenerativeModel(GEMINI_MODEL_TEXT, system_instruction=SYSTEM_PROMPT)
+            response = model.generate_content(
+                [
+                    f"Context:\n{context_text}",
+                    f"Question: {query}",
+                    "Answer with citations in the form [doc_id:page].",
+                ]
+            )
+            metrics.incr("llm_calls", model=GEMINI_MODEL_TEXT, purpose="answer")
+            metrics.record_usage(response, GEMINI_MODEL_TEXT)
+        answer_text = response.text.strip() if response.text else ""
+
+        return AgentAnswer(answer=answer_text, citations=citations, tool_calls=tool_calls, extra=extra or None)
 
 
 def _route_tool_call(query: str) -> Optional[ToolCall]:
     model = genai.GenerativeModel(GEMINI_MODEL_TEXT, system_instruction=TOOL_ROUTER_PROMPT)
     response = model.generate_content([f"Query: {query}"])
+    metrics.incr("llm_calls", model=GEMINI_MODEL_TEXT, purpose="route")
+    metrics.record_usage(response, GEMINI_MODEL_TEXT)
     raw = response.text.strip() if response.text else ""
 
     try:
@@ -10,10 +10,11 @@ ROOT_DIR = Path(__file__).resolve().parent
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from config import TOP_K_DEFAULT, USE_VISION_DEFAULT
+from config import ENABLE_METRICS, TOP_K_DEFAULT, USE_VISION_DEFAULT
 from ingestion.pdf_ingest import ingest_pdfs
 from models import DocumentRecord, SectionRecord
 from retrieval.vector_store import VectorStore
+from utils import metrics
 from utils.cache import compute_file_hash, index_paths
 from agent.qa_agent import answer_query
 
@@ -80,6 +81,7 @@ st.sidebar.header("Settings")
 use_vision = st.sidebar.checkbox("Use vision for figures/equations", value=USE_VISION_DEFAULT)
 top_k = st.sidebar.slider("Top K", min_value=1, max_value=10, value=TOP_K_DEFAULT)
 enable_arxiv = st.sidebar.checkbox("Enable Arxiv tool", value=True)
+show_metrics = st.sidebar.checkbox("Show metrics", value=ENABLE_METRICS, disabled=not ENABLE_METRICS)
 
 uploaded_files = st.file_uploader("Upload PDF files", type=["pdf"], accept_multiple_files=True)
 
@@ -103,18 +105,23 @@ if st.button("Build index"):
         cache_key = "_".join(cache_key_parts)
         index_path, docs_path = index_paths("data", cache_key)
 
-        if os.path.exists(index_path) and os.path.exists(docs_path):
-            store = VectorStore.load(index_path)
-            documents = _load_documents(docs_path)
-            st.info("Loaded cached index.")
-        else:
-            with st.spinner("Ingesting PDFs..."):
-                documents, chunks = ingest_pdfs(paths, use_vision=use_vision)
-                store = VectorStore()
-                store.add(chunks)
-            store.save(index_path)
-            _save_documents(docs_path, documents)
-            st.success("Index built and cached.")
+        with metrics.span("build_index", files=len(paths)) as build_span:
+            if os.path.exists(index_path) and os.path.exists(docs_path):
+                build_span.set(cached=True)
+                store = VectorStore.load(index_path)
+                documents = _load_documents(docs_path)
+                metrics.incr("index_cache", result="hit")
+                st.info("Loaded cached index.")
+            else:
+                build_span.set(cached=False)
+                metrics.incr("index_cache", result="miss")
+                with st.spinner("Ingesting PDFs..."):
+                    documents, chunks = ingest_pdfs(paths, use_vision=use_vision)
+                    store = VectorStore()
+                    store.add(chunks)
+                store.save(index_path)
+                _save_documents(docs_path, documents)
+                st.success("Index built and cached.")
 
         st.session_state.store = store
         st.session_state.documents = documents
@@ -140,3 +147,28 @@ if st.button("Ask"):
         if answer.extra and answer.extra.get("arxiv"):
             st.subheader("Arxiv Results")
             st.write(answer.extra["arxiv"])
+
+if ENABLE_METRICS and show_metrics:
+    with st.sidebar.expander("Metrics", expanded=False):
+        if st.button("Reset metrics"):
+            metrics.REGISTRY.reset()
+        trace = metrics.REGISTRY.last_trace()
+        if trace:
+            st.caption("Last trace")
+            st.code(metrics.format_trace(trace), language="text")
+        counters = metrics.REGISTRY.counters()
+        if counters:
+            st.caption("Counters")
+            st.json(counters)
+        st.download_button(
+            "Download JSON lines",
+            metrics.REGISTRY.export_jsonl(),
+            file_name="metrics.jsonl",
+            mime="application/json",
+        )
+        st.download_button(
+            "Download Prometheus text",
+            metrics.REGISTRY.export_prometheus(),
+            file_name="metrics.prom",
+            mime="text/plain",
+        )
@@ -15,6 +15,9 @@ MAX_CHUNK_CHARS = int(os.getenv("MAX_CHUNK_CHARS", "1200"))
 CHUNK_OVERLAP_CHARS = int(os.getenv("CHUNK_OVERLAP_CHARS", "200"))
 MAX_CONTEXT_CHARS = int(os.getenv("MAX_CONTEXT_CHARS", "8000"))
 
+ENABLE_METRICS = os.getenv("ENABLE_METRICS", "false").lower() in ("1", "true", "yes")
+METRICS_MAX_SPANS = int(os.getenv("METRICS_MAX_SPANS", "5000"))
+
 
 def require_api_key() -> None:
     if not GEMINI_API_KEY:
@@ -8,16 +8,20 @@ from config import CHUNK_OVERLAP_CHARS, MAX_CHUNK_CHARS
 from models import Chunk, DocumentRecord, SectionRecord
 from utils.text import chunk_text, normalize_text
 from ingestion.vision_enhancer import extract_visual_elements
+from utils import metrics
 
 
 def ingest_pdfs(paths: List[str], use_vision: bool = False) -> Tuple[List[DocumentRecord], List[Chunk]]:
     documents: List[DocumentRecord] = []
     all_chunks: List[Chunk] = []
 
-    for path in paths:
-        document = extract_document(path, use_vision)
-        documents.append(document)
-        all_chunks.extend(build_chunks(document))
+    with metrics.span("ingest_pdfs", files=len(paths), use_vision=use_vision):
+        for path in paths:
+            with metrics.span("extract_document", path=os.path.basename(path)):
+                document = extract_document(path, use_vision)
+            documents.append(document)
+            with metrics.span("build_chunks", doc_id=document.doc_id):
+                all_chunks.extend(build_chunks(document))
 
     return documents, all_chunks
 
@@ -31,26 +35,31 @@ def extract_document(path: str, use_vision: bool) -> DocumentRecord:
 
     with pdfplumber.open(path) as plumber_doc:
         for page_index in range(len(doc)):
-            page = doc[page_index]
             page_num = page_index + 1
-            text = page.get_text() or ""
-            tables_md = _extract_tables(plumber_doc, page_index)
-
-            vision_notes = ""
-            if use_vision:
-                pix = page.get_pixmap(dpi=200)
-                vision = extract_visual_elements(pix.tobytes("png"))
-                vision_notes = _format_vision_notes(vision)
-
-            sections.append(
-                SectionRecord(
-                    title=f"Page {page_num}",
-                    page=page_num,
-                    content=normalize_text(text),
-                    tables=tables_md,
-                    vision_notes=vision_notes,
+            with metrics.span("ingest_page", doc_id=doc_id, page=page_num):
+                page = doc[page_index]
+                with metrics.span("page.get_text"):
+                    text = page.get_text() or ""
+                with metrics.span("page.extract_tables"):
+                    tables_md = _extract_tables(plumber_doc, page_index)
+
+                vision_notes = ""
+                if use_vision:
+                    with metrics.span("page.vision"):
+                        pix = page.get_pixmap(dpi=200)
+                        vision = extract_visual_elements(pix.tobytes("png"))
+                        vision_notes = _format_vision_notes(vision)
+
+                sections.append(
+                    SectionRecord(
+                        title=f"Page {page_num}",
+                        page=page_num,
+                        content=normalize_text(text),
+                        tables=tables_md,
+                        vision_notes=vision_notes,
+                    )
                 )
-            )
+            metrics.incr("pages_ingested")
 
     doc.close()
     return DocumentRecord(doc_id=doc_id, title=title, path=path, sections=sections)
@@ -6,6 +6,7 @@ import google.generativeai as genai
 from PIL import Image
 
 from config import GEMINI_API_KEY, GEMINI_MODEL_VISION, require_api_key
+from utils import metrics
 
 
 def extract_visual_elements(png_bytes: bytes) -> Dict[str, str]:
@@ -21,6 +22,8 @@ def extract_visual_elements(png_bytes: bytes) -> Dict[str, str]:
     )
 
     response = model.generate_content([prompt, image])
+    metrics.incr("llm_calls", model=GEMINI_MODEL_VISION, purpose="vision")
+    metrics.record_usage(response, GEMINI_MODEL_VISION)
     text = response.text.strip() if response.text else ""
 
     try:
@@ -1,29 +1,42 @@
+import time
 from typing import List
+
 import google.generativeai as genai
 
 from config import GEMINI_API_KEY, GEMINI_MODEL_EMBED, require_api_key
+from utils import metrics
 
 
 def embed_texts(texts: List[str]) -> List[List[float]]:
     require_api_key()
     genai.configure(api_key=GEMINI_API_KEY)
     vectors: List[List[float]] = []
-    for text in texts:
-        result = genai.embed_content(
-            model=GEMINI_MODEL_EMBED,
-            content=text,
-            task_type="RETRIEVAL_DOCUMENT",
-        )
-        vectors.append(result["embedding"])
+    with metrics.span("embed_texts", count=len(texts)):
+        for text in texts:
+            started = time.perf_counter()
+            result = genai.embed_content(
+                model=GEMINI_MODEL_EMBED,
+                content=text,
+                task_type="RETRIEVAL_DOCUMENT",
+            )
+            metrics.observe("embed_call_seconds", time.perf_counter() - started, task="document")
+            metrics.incr("embed_calls", task="document")
+            metrics.incr("embed_chars", len(text), task="document")
+            vectors.append(result["embedding"])
     return vectors
 
 
 def embed_query(text: str) -> List[float]:
     require_api_key()
     genai.configure(api_key=GEMINI_API_KEY)
-    result = genai.embed_content(
-        model=GEMINI_MODEL_EMBED,
-        content=text,
-        task_type="RETRIEVAL_QUERY",
-    )
+    with metrics.span("embed_query"):
+        started = time.perf_counter()
+        result = genai.embed_content(
+            model=GEMINI_MODEL_EMBED,
+            content=text,
+            task_type="RETRIEVAL_QUERY",
+        )
+        metrics.observe("embed_call_seconds", time.perf_counter() - started, task="query")
+    metrics.incr("embed_calls", task="query")
+    metrics.incr("embed_chars", len(text), task="query")
     return result["embedding"]
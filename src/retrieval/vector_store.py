@@ -5,6 +5,7 @@ import numpy as np
 
 from models import Chunk, RetrievalResult
 from retrieval.embeddings import embed_query, embed_texts
+from utils import metrics
 
 
 class VectorStore:
@@ -15,18 +16,21 @@ class VectorStore:
     def add(self, chunks: List[Chunk]) -> None:
         if not chunks:
             return
-        embeddings = embed_texts([chunk.text for chunk in chunks])
-        self.vectors.extend(embeddings)
-        self.chunks.extend(chunks)
+        with metrics.span("vector_store.add", chunks=len(chunks)):
+            embeddings = embed_texts([chunk.text for chunk in chunks])
+            self.vectors.extend(embeddings)
+            self.chunks.extend(chunks)
 
     def search(self, query: str, top_k: int) -> List[RetrievalResult]:
         if not self.vectors:
             return []
 
-        query_vec = np.array(embed_query(query))
-        matrix = np.array(self.vectors)
-        scores = self._cosine_similarity(matrix, query_vec)
-        top_indices = np.argsort(scores)[::-1][:top_k]
+        with metrics.span("vector_store.search", top_k=top_k, size=len(self.vectors)):
+            query_vec = np.array(embed_query(query))
+            with metrics.span("vector_store.score"):
+                matrix = np.array(self.vectors)
+                scores = self._cosine_similarity(matrix, query_vec)
+                top_indices = np.argsort(scores)[::-1][:top_k]
 
         results: List[RetrievalResult] = []
         for idx in top_indices:
@@ -34,20 +38,22 @@ class VectorStore:
         return results
 
     def save(self, path: str) -> None:
-        payload = {
-            "vectors": self.vectors,
-            "chunks": [chunk.to_dict() for chunk in self.chunks],
-        }
-        with open(path, "w", encoding="utf-8") as file_handle:
-            json.dump(payload, file_handle, indent=2)
+        with metrics.span("vector_store.save", size=len(self.vectors)):
+            payload = {
+                "vectors": self.vectors,
+                "chunks": [chunk.to_dict() for chunk in self.chunks],
+            }
+            with open(path, "w", encoding="utf-8") as file_handle:
+                json.dump(payload, file_handle, indent=2)
 
     @staticmethod
     def load(path: str) -> "VectorStore":
-        with open(path, "r", encoding="utf-8") as file_handle:
-            payload = json.load(file_handle)
-        store = VectorStore()
-        store.vectors = payload.get("vectors", [])
-        store.chunks = [Chunk.from_dict(item) for item in payload.get("chunks", [])]
+        with metrics.span("vector_store.load"):
+            with open(path, "r", encoding="utf-8") as file_handle:
+                payload = json.load(file_handle)
+            store = VectorStore()
+            store.vectors = payload.get("vectors", [])
+            store.chunks = [Chunk.from_dict(item) for item in payload.get("chunks", [])]
         return store
 
     @staticmethod
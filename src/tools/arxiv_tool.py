@@ -4,6 +4,8 @@ from typing import Dict, List
 
 import requests
 
+from utils import metrics
+
 
 def search_arxiv(query: str, max_results: int = 5) -> List[Dict[str, str]]:
     base_url = "http://export.arxiv.org/api/query"
@@ -12,6 +14,7 @@ def search_arxiv(query: str, max_results: int = 5) -> List[Dict[str, str]]:
         "start": 0,
         "max_results": max_results,
     }
+    metrics.incr("arxiv_requests")
     response = requests.get(base_url, params=params, timeout=30)
     response.raise_for_status()
 
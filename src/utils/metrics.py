@@ -0,0 +1,272 @@
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from config import ENABLE_METRICS, METRICS_MAX_SPANS
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float
+    duration: float = 0.0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": "span",
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration": self.duration,
+            "attrs": self.attrs,
+            "error": self.error,
+        }
+
+
+@dataclass
+class Histogram:
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    counts: List[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.total += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+
+class _NoopSpan:
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    def __init__(self, registry: "MetricsRegistry", name: str, attrs: Dict[str, Any]) -> None:
+        self._registry = registry
+        self._name = name
+        self._attrs = attrs
+        self._record: Optional[SpanRecord] = None
+        self._t0 = 0.0
+
+    def __enter__(self) -> "_Span":
+        stack = self._registry._stack()
+        parent = stack[-1] if stack else None
+        self._record = SpanRecord(
+            name=self._name,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex[:16],
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            start=time.time(),
+            attrs=self._attrs,
+        )
+        stack.append(self._record)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        record = self._record
+        record.duration = time.perf_counter() - self._t0
+        if exc_type is not None:
+            record.error = exc_type.__name__
+        stack = self._registry._stack()
+        if stack and stack[-1] is record:
+            stack.pop()
+        self._registry._finish_span(record)
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        self._attrs.update(attrs)
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = False, max_spans: int = 5000) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._spans: Deque[SpanRecord] = deque(maxlen=max_spans)
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+
+    def _stack(self) -> List[SpanRecord]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+        return stack
+
+    def span(self, name: str, **attrs: Any):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name, attrs)
+
+    def incr(self, name: str, value: float = 1, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = Histogram()
+                self._histograms[key] = histogram
+            histogram.observe(value)
+
+    def _finish_span(self, record: SpanRecord) -> None:
+        with self._lock:
+            self._spans.append(record)
+        self.observe("span_duration_seconds", record.duration, span=record.name)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            self._histograms.clear()
+
+    def spans(self) -> List[SpanRecord]:
+        with self._lock:
+            return list(self._spans)
+
+    def counters(self) -> Dict[str, float]:
+        with self._lock:
+            return {_format_name(name, labels): value for (name, labels), value in sorted(self._counters.items())}
+
+    def last_trace(self) -> List[SpanRecord]:
+        spans = self.spans()
+        for record in reversed(spans):
+            if record.parent_id is None:
+                return [item for item in spans if item.trace_id == record.trace_id]
+        return []
+
+    def export_jsonl(self) -> str:
+        lines = [json.dumps(record.to_dict()) for record in self.spans()]
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                lines.append(json.dumps({"type": "counter", "name": name, "labels": dict(labels), "value": value}))
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                lines.append(
+                    json.dumps(
+                        {
+                            "type": "histogram",
+                            "name": name,
+                            "labels": dict(labels),
+                            "buckets": list(histogram.buckets),
+                            "counts": list(histogram.counts),
+                            "sum": histogram.total,
+                            "count": histogram.count,
+                        }
+                    )
+                )
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def export_prometheus(self, prefix: str = "docqa_") -> str:
+        lines: List[str] = []
+        with self._lock:
+            seen = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                metric = prefix + name + "_total"
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} counter")
+                    seen.add(metric)
+                lines.append(f"{metric}{_prom_labels(labels)} {value}")
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                metric = prefix + name
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} histogram")
+                    seen.add(metric)
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    bucket_labels = labels + (("le", repr(bound)),)
+                    lines.append(f"{metric}_bucket{_prom_labels(bucket_labels)} {count}")
+                lines.append(f"{metric}_bucket{_prom_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"{metric}_sum{_prom_labels(labels)} {histogram.total}")
+                lines.append(f"{metric}_count{_prom_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+
+def format_trace(spans: List[SpanRecord]) -> str:
+    children: Dict[Optional[str], List[SpanRecord]] = {}
+    for record in spans:
+        children.setdefault(record.parent_id, []).append(record)
+
+    lines: List[str] = []
+
+    def _walk(parent_id: Optional[str], depth: int) -> None:
+        for record in sorted(children.get(parent_id, []), key=lambda item: item.start):
+            error = f" !{record.error}" if record.error else ""
+            lines.append(f"{'  ' * depth}{record.name}: {record.duration * 1000:.1f} ms{error}")
+            _walk(record.span_id, depth + 1)
+
+    _walk(None, 0)
+    return "\n".join(lines)
+
+
+def record_usage(response: Any, model: str) -> None:
+    if not REGISTRY.enabled:
+        return
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    REGISTRY.incr("llm_prompt_tokens", getattr(usage, "prompt_token_count", 0) or 0, model=model)
+    REGISTRY.incr("llm_output_tokens", getattr(usage, "candidates_token_count", 0) or 0, model=model)
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_name(name: str, labels: LabelKey) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{key}={value}" for key, value in labels) + "}"
+
+
+def _prom_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    escaped = []
+    for key, value in labels:
+        value = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        escaped.append(f'{key}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+REGISTRY = MetricsRegistry(enabled=ENABLE_METRICS, max_spans=METRICS_MAX_SPANS)
+span = REGISTRY.span
+incr = REGISTRY.incr
+observe = REGISTRY.observe